@@ -7,6 +7,8 @@ from streamlit.components.v1 import html
 import os
 from pymongo import MongoClient
 import datetime
+import bisect
+import threading
 
 # Page Configuration
 st.set_page_config(page_title="FLINTA Space App", page_icon="🏳️‍🌈")
@@ -37,7 +39,7 @@ def connect_to_mongo():
 # Function to load events from CSV file
 def load_events():
     if not os.path.exists('flinta-app/events.csv'):
-        df = pd.DataFrame(columns=["title", "date", "adress", "description", "source"])
+        df = pd.DataFrame(columns=["title", "date", "address", "description", "source"])
         df.to_csv('flinta-app/events.csv', index=False)
     else:
         df = pd.read_csv('flinta-app/events.csv')
@@ -48,16 +50,75 @@ def load_events():
 
     return df
 
+# Lock shared by all sessions of this server, so saving and archiving never write events.csv at the same time
+@st.cache_resource
+def get_events_lock():
+    return threading.Lock()
+
+# Function to write a dataframe to a CSV file in one step (temp file + rename), so a crash never leaves it half-written
+def write_csv_atomic(df, path):
+    tmp_path = path + '.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
 # Function to save new event to CSV file
 def save_event(new_event):
-    # Load existing events
-    df = load_events()
+    with get_events_lock():
+        # Load existing events
+        df = load_events()
+
+        # Append the new event to the dataframe
+        df = pd.concat([df, pd.DataFrame([new_event])], ignore_index=True)
+
+        # Save the updated dataframe back to the CSV file
+        write_csv_atomic(df, 'flinta-app/events.csv')
+
+# Function to build a date index over the events (sorted dates + matching records)
+# The modification time of the CSV file is passed in, so the cache is rebuilt whenever the file changes
+@st.cache_data(max_entries=1)
+def load_event_index(file_mtime):
+    df = load_events().sort_values("date", kind="stable")
+    dates = df['date'].astype(str).tolist()
+    records = df.to_dict(orient="records")
+    return dates, records
+
+# Function to get only the events from a given day onward (range lookup with bisect)
+def get_upcoming_events(from_date):
+    if not os.path.exists('flinta-app/events.csv'):
+        return []
+    dates, records = load_event_index(os.path.getmtime('flinta-app/events.csv'))
+    start = bisect.bisect_left(dates, from_date.strftime("%Y-%m-%d"))
+    return records[start:]
+
+# Function to move past events from events.csv into events_archive.csv
+# The date of the last run is kept in a marker file, so the compaction runs at most once a day
+def archive_past_events(today):
+    marker_path = 'flinta-app/events_archive_last_run.txt'
+    archive_path = 'flinta-app/events_archive.csv'
 
-    # Append the new event to the dataframe
-    df = pd.concat([df, pd.DataFrame([new_event])], ignore_index=True)
+    with get_events_lock():
+        if os.path.exists(marker_path):
+            with open(marker_path) as marker:
+                if marker.read().strip() == today:
+                    return 0
 
-    # Save the updated dataframe back to the CSV file
-    df.to_csv('events.csv', index=False)
+        df = load_events()
+        is_past = df['date'].astype(str) < today
+
+        if is_past.any():
+            # Add the expired events to the archive (duplicates from an interrupted earlier run are dropped)
+            archive = df[is_past]
+            if os.path.exists(archive_path):
+                archive = pd.concat([pd.read_csv(archive_path), archive], ignore_index=True).drop_duplicates()
+            write_csv_atomic(archive, archive_path)
+
+            # Keep only the current events in the main file
+            write_csv_atomic(df[~is_past], 'flinta-app/events.csv')
+
+        with open(marker_path, 'w') as marker:
+            marker.write(today)
+
+    return int(is_past.sum())
 
 # Sidebar title (Header for the Sidebar Menu)
 st.sidebar.markdown("""
@@ -172,8 +233,15 @@ elif st.session_state.selected_page == "Events":
     We've got you covered! Just scroll through the slides to find exciting gatherings, workshops, and more! 🌈✨
     """)
 
-    # Load events
-    events = load_events().to_dict(orient="records")
+    # Move expired events to the archive, then load only events from today onward
+    today = datetime.date.today()
+    archive_past_events(today.strftime("%Y-%m-%d"))
+    events = get_upcoming_events(today)
+
+    # Nothing to show in the carousel if there are no upcoming events
+    if not events:
+        st.info("There are no upcoming events right now - check back soon or add your own! ✨")
+        st.stop()
 
     # Carousel HTML (Carousel design & technical code, improved and created with Chat gpt)
     carousel_html = """
@@ -270,13 +338,19 @@ elif st.session_state.selected_page == "Events":
     event_slides = ""
     for event in events:
         event_type = "Official Event" if event['source'] == "official" else "📝 User-Submitted Event"
+        # Older rows stored the address under the misspelled 'adress' column
+        address = event.get('address')
+        if pd.isna(address):
+            address = event.get('adress')
+        if pd.isna(address):
+            address = ""
 
         slide = f"""
             <div class="carousel-slide">
                 <h2>{event['title']}</h2>
                 <h4 style="color: yellow;">{event_type}</h4>
                 <p><strong>Date:</strong> {event['date']}</p>
-                <p><strong>Address:</strong> {event['address']}</p>
+                <p><strong>Address:</strong> {address}</p>
                 <p>{event['description']}</p>
             </div>
         """
@@ -319,7 +393,7 @@ elif st.session_state.selected_page == "Add Your Event":
                 new_event = {
                     "title": event_title,
                     "date": event_date.strftime("%Y-%m-%d"),
-                    "adress": event_address,
+                    "address": event_address,
                     "description": event_description,
                     "source": "user"
                 }